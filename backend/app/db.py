@@ -6,6 +6,7 @@ from typing import Optional, Dict
 import logging
 from contextlib import asynccontextmanager
 import sqlite3
+from aiosqlitepool import SQLiteConnectionPool
 try:
     from .schema_validator import SchemaValidator
 except ImportError:
@@ -23,8 +24,43 @@ class DatabaseManager:
             db_path = os.getenv('DATABASE_PATH', 'meeting_minutes.db')
         self.db_path = db_path
         self.schema_validator = SchemaValidator(self.db_path)
+        self._pool = None
         self._init_db()
 
+    async def init_pool(self, pool_size: int = None):
+        """Create the shared aiosqlite connection pool (call once at app startup).
+
+        Pooled connections keep SQLite's page cache warm and avoid the
+        open/close syscall pair every query paid before.
+        """
+        if self._pool is None:
+            if pool_size is None:
+                pool_size = int(os.getenv('DB_POOL_SIZE', (os.cpu_count() or 4) * 2 + 1))
+            self._pool = SQLiteConnectionPool(
+                self._pooled_connection,
+                pool_size=pool_size
+            )
+            logger.info(f"Initialized SQLite connection pool (size={pool_size})")
+
+    async def _pooled_connection(self):
+        """Open a pooled connection with write-friendly pragmas.
+
+        WAL lets readers proceed during writes; synchronous=NORMAL drops the
+        per-commit fsync to one per WAL checkpoint, which is safe for this
+        workload (a crash can lose the last commit, never corrupt the file).
+        """
+        conn = await aiosqlite.connect(self.db_path)
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    async def close_pool(self):
+        """Close the connection pool (call at app shutdown)."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Closed SQLite connection pool")
+
     def _init_db(self):
         """Initialize the database with legacy approach"""
         try:
@@ -175,12 +211,17 @@ class DatabaseManager:
 
     @asynccontextmanager
     async def _get_connection(self):
-        """Get a new database connection"""
-        conn = await aiosqlite.connect(self.db_path)
-        try:
-            yield conn
-        finally:
-            await conn.close()
+        """Get a database connection, reusing the pool when it is running"""
+        if self._pool is not None:
+            async with self._pool.connection() as conn:
+                yield conn
+        else:
+            # Fallback for callers running before startup (e.g. scripts)
+            conn = await aiosqlite.connect(self.db_path)
+            try:
+                yield conn
+            finally:
+                await conn.close()
 
     async def create_process(self, meeting_id: str) -> str:
         """Create a new process entry or update existing one and return its ID"""
@@ -424,6 +465,30 @@ class DatabaseManager:
             logger.error(f"Error saving transcript: {str(e)}")
             raise
 
+    async def save_meeting_transcripts_bulk(self, meeting_id: str, rows: list):
+        """Save many transcripts for a meeting in a single transaction.
+
+        Each row is (transcript, timestamp, summary, action_items, key_points,
+        audio_start_time, audio_end_time, duration). One executemany inside one
+        commit costs a single fsync regardless of row count, where the per-row
+        save_meeting_transcript path pays one per transcript.
+        """
+        if not rows:
+            return True
+        try:
+            async with self._get_connection() as conn:
+                await conn.executemany("""
+                    INSERT INTO transcripts (
+                        meeting_id, transcript, timestamp, summary, action_items, key_points,
+                        audio_start_time, audio_end_time, duration
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [(meeting_id, *row) for row in rows])
+                await conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error saving transcripts in bulk: {str(e)}")
+            raise
+
     async def get_meeting(self, meeting_id: str):
         """Get a meeting by ID with all its transcripts"""
         try:
@@ -492,6 +557,21 @@ class DatabaseManager:
                 'created_at': row[2]
             } for row in rows]
 
+    async def get_all_meetings_minimal(self):
+        """Get id and title for all meetings, projecting at the SQL layer.
+
+        Returns the list-of-dict shape /get-meetings serves directly, so the
+        endpoint doesn't rebuild a dict per row just to drop columns.
+        """
+        async with self._get_connection() as conn:
+            cursor = await conn.execute("""
+                SELECT id, title
+                FROM meetings
+                ORDER BY created_at DESC
+            """)
+            rows = await cursor.fetchall()
+            return [{'id': row[0], 'title': row[1]} for row in rows]
+
     async def delete_meeting(self, meeting_id: str):
         """Delete a meeting and all its associated data"""
         if not meeting_id or not meeting_id.strip():
@@ -1,8 +1,12 @@
 import asyncio
+import itertools
 import logging
 import os
+from collections import deque
 from typing import List, Tuple, Literal, Optional
 
+import orjson
+
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from pydantic_ai import Agent
@@ -15,6 +19,7 @@ from pydantic_ai.providers.openai import OpenAIProvider
 from ollama import AsyncClient
 
 from db import DatabaseManager
+from semantic_cache import SemanticChunkCache
 
 # Reuse Pydantic models from transcript_processor
 from transcript_processor import SummaryResponse, Block, Section, MeetingNotes, People
@@ -22,6 +27,188 @@ from transcript_processor import SummaryResponse, Block, Section, MeetingNotes,
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Static summarization instructions, built once at import time. Keeping the
+# static part separate from the per-chunk text means we only concatenate the
+# chunk per call, and providers that cache prompt prefixes (OpenAI, Anthropic,
+# Ollama) can reuse the already-processed instructions across chunks.
+_PROMPT_PREFIX = """
+        Analyze the following meeting transcript chunk and extract key information into a JSON object.
+
+        **JSON Structure Requirement:**
+        {
+          "MeetingName": "string or null",
+          "People": { "title": "People", "blocks": [] },
+          "SessionSummary": {
+            "title": "Notes",
+            "blocks": [ { "id": "string", "type": "bullet", "content": "提炼的核心信息", "color": "" } ]
+          },
+          "CriticalDeadlines": { "title": "Critical Deadlines", "blocks": [] },
+          "KeyItemsDecisions": { "title": "Key Items & Decisions", "blocks": [] },
+          "ImmediateActionItems": {
+            "title": "Action Items",
+            "blocks": [ { "id": "string", "type": "bullet", "content": "任务描述", "color": "" } ]
+          },
+          "NextSteps": { "title": "Next Steps", "blocks": [] },
+          "MeetingNotes": { "sections": [] }
+        }
+
+        **Instructions:**
+        1. Use "SessionSummary" for **Notes**: 提炼总结当前内容的核心信息，保持简洁。
+        2. Use "ImmediateActionItems" for **Action Items**: 识别待办任务：只有当某人要完成某项任务时才算是待办任务。必须包含描述，若有负责人或截止日期请在任务描述后添加，若没有则只包含描述。
+        3. 所有回答必须使用 **中文**。
+        4. 只返回 JSON 对象，不要有任何解释文字。
+        5. 其他不相关的字段（People, NextSteps等）请保持 "blocks" 为空数组。
+"""
+
+_PROMPT_CHUNK_HEADER = """
+        **Transcript Chunk:**
+        ---
+        """
+
+_PROMPT_SUFFIX = """
+        ---
+        """
+
+# Batching limits for the consumer loop: each dequeue waits briefly for more
+# chunks to arrive, then drains up to this many characters into one LLM call.
+_MAX_BATCH_CHARS = 4000
+_COALESCE_DELAY_SECONDS = 0.05
+
+# Block types the frontend can render; anything else is coerced to 'text'.
+_VALID_TYPES = frozenset({'bullet', 'heading1', 'heading2', 'text'})
+
+# Monotonic source for generated block ids. A counter is unique within the
+# process and avoids the os.urandom syscall uuid4 pays per missing id.
+_block_counter = itertools.count()
+
+# API keys change at human timescale but were fetched from SQLite on every
+# summarizer start; cache them per process and invalidate on key rotation.
+_api_key_cache = {}
+_api_key_lock = asyncio.Lock()
+
+
+async def _cached_api_key(db, provider):
+    """Return the API key for a provider, hitting the DB at most once per process."""
+    if provider not in _api_key_cache:
+        async with _api_key_lock:
+            if provider not in _api_key_cache:
+                _api_key_cache[provider] = await db.get_api_key(provider)
+    return _api_key_cache[provider]
+
+
+def invalidate_api_key_cache(provider: Optional[str] = None):
+    """Drop cached API keys after a key is saved or rotated."""
+    if provider is None:
+        _api_key_cache.clear()
+    else:
+        _api_key_cache.pop(provider, None)
+
+
+# Concurrency limits shared by every summarizer talking to the same provider,
+# so batched meetings can't stampede one endpoint into 429s. Sized per
+# provider via e.g. OPENAI_CONCURRENCY / OLLAMA_CONCURRENCY.
+_provider_semaphores = {}
+
+
+def _provider_semaphore(provider: str) -> asyncio.Semaphore:
+    sem = _provider_semaphores.get(provider)
+    if sem is None:
+        limit = int(os.getenv(f"{provider.upper().replace('-', '_')}_CONCURRENCY", 4))
+        sem = _provider_semaphores[provider] = asyncio.Semaphore(limit)
+    return sem
+
+
+# Cloud provider constructors keyed by provider name. Each entry maps to
+# (model factory, DB key-column provider, env-var name for the error message,
+# whether a missing key should fail initialization). Ollama and builtin-ai
+# remain explicit special cases in initialize().
+_PROVIDERS = {
+    "claude": (lambda key, model, http: AnthropicModel(model, provider=AnthropicProvider(api_key=key, http_client=http)),
+               "claude", "ANTHROPIC_API_KEY", True),
+    "groq": (lambda key, model, http: GroqModel(model, provider=GroqProvider(api_key=key, http_client=http)),
+             "groq", "GROQ_API_KEY", True),
+    "openai": (lambda key, model, http: OpenAIModel(model, provider=OpenAIProvider(api_key=key, http_client=http)),
+               "openai", "OPENAI_API_KEY", True),
+    # OpenRouter is OpenAI-compatible
+    "openrouter": (lambda key, model, http: OpenAIModel(model, provider=OpenAIProvider(api_key=key, base_url="https://openrouter.ai/api/v1", http_client=http)),
+                   "openrouter", "OPENROUTER_API_KEY", True),
+    # For custom-openai, we should ideally have the endpoint too.
+    # If not provided, we fallback to OpenAI default.
+    "custom-openai": (lambda key, model, http: OpenAIModel(model, provider=OpenAIProvider(api_key=key, http_client=http)),
+                      "openai", "OPENAI_API_KEY", False),
+}
+
+# Sections merged verbatim from each chunk summary into the rolling summary.
+_SECTION_ATTRS = ('people', 'session_summary', 'critical_deadlines',
+                  'key_items_decisions', 'immediate_action_items', 'next_steps')
+
+# Set SUMMARIZER_STRICT_VALIDATION=1 to re-enable full Pydantic validation of
+# normalized Ollama responses (useful when debugging schema drift).
+_STRICT_VALIDATION = os.getenv('SUMMARIZER_STRICT_VALIDATION', '').lower() in ('1', 'true', 'yes')
+
+
+def _construct_summary(data):
+    """Build a SummaryResponse from normalized data without re-validation.
+
+    _fix_structure has already guaranteed every block carries a valid 'type',
+    an 'id' and a 'color', so the full Pydantic validation pass (the dominant
+    per-response CPU cost) can be skipped via model_construct.
+    """
+    def build_section(cls, value):
+        blocks = [Block.model_construct(**b) for b in value.get('blocks') or []]
+        return cls.model_construct(title=value.get('title', ''), blocks=blocks)
+
+    notes_data = data.get('MeetingNotes') or {}
+    meeting_notes = MeetingNotes.model_construct(
+        sections=[build_section(Section, s) for s in notes_data.get('sections') or []]
+    )
+    return SummaryResponse.model_construct(
+        meeting_name=data.get('MeetingName'),
+        people=build_section(People, data.get('People') or {}),
+        session_summary=build_section(Section, data.get('SessionSummary') or {}),
+        critical_deadlines=build_section(Section, data.get('CriticalDeadlines') or {}),
+        key_items_decisions=build_section(Section, data.get('KeyItemsDecisions') or {}),
+        immediate_action_items=build_section(Section, data.get('ImmediateActionItems') or {}),
+        next_steps=build_section(Section, data.get('NextSteps') or {}),
+        meeting_notes=meeting_notes,
+    )
+
+
+def _fix_structure(data):
+    """Walk the parsed Ollama JSON iteratively and repair block fields in place.
+
+    Ensures every entry of a 'blocks' array is a dict carrying a 'content',
+    a valid 'type', a non-empty 'id' and a 'color' (non-dict entries are
+    dropped, missing fields defaulted), so downstream model_construct can
+    trust the shape. Iterative instead of recursive so large responses don't
+    pay a Python call frame per nested node.
+    """
+    stack = deque([data])
+    while stack:
+        obj = stack.popleft()
+        if isinstance(obj, dict):
+            blocks = obj.get('blocks')
+            if isinstance(blocks, list):
+                # Everything in a blocks array is a block, even when the
+                # model forgot its fields; anything that isn't a dict at
+                # all cannot be repaired and is dropped.
+                blocks[:] = [b for b in blocks if isinstance(b, dict)]
+                for block in blocks:
+                    block.setdefault('content', '')
+            sections = obj.get('sections')
+            if isinstance(sections, list):
+                sections[:] = [s for s in sections if isinstance(s, dict)]
+            if 'content' in obj:
+                # It's likely a block
+                if obj.get('type') not in _VALID_TYPES:
+                    obj['type'] = 'text'
+                if not obj.get('id'):
+                    obj['id'] = f"block-{next(_block_counter):x}"
+                obj.setdefault('color', '')
+            stack.extend(v for v in obj.values() if isinstance(v, (dict, list)))
+        else:  # list
+            stack.extend(item for item in obj if isinstance(item, (dict, list)))
+
 
 class IncrementalSummarizer:
     """
@@ -29,12 +216,20 @@ class IncrementalSummarizer:
     Manages a rolling summary that gets updated with each new transcript chunk.
     """
 
-    def __init__(self, meeting_id: str, model_provider: str, model_name: str, custom_prompt: str = "", db_manager: DatabaseManager = None):
+    def __init__(self, meeting_id: str, model_provider: str, model_name: str, custom_prompt: str = "", db_manager: DatabaseManager = None, static_system_prompt: str = "", http_client=None):
         self.meeting_id = meeting_id
         self.model_provider = model_provider
         self.model_name = model_name
         self.custom_prompt = custom_prompt
+        self.static_system_prompt = static_system_prompt
         self.db = db_manager if db_manager else DatabaseManager()
+        # Shared app-wide httpx.AsyncClient (owned by the FastAPI lifespan).
+        # When set, every cloud provider call reuses its keep-alive connection
+        # pool instead of paying a TCP+TLS handshake per session.
+        self._http_client = http_client
+        # Stable per-session system prompt, assembled once in initialize() so
+        # the provider sees an identical cacheable prefix on every chunk.
+        self._system_prompt = _PROMPT_PREFIX
         
         self.rolling_summary = SummaryResponse(
             people=People(title="People", blocks=[]),
@@ -45,10 +240,29 @@ class IncrementalSummarizer:
             next_steps=Section(title="Next Steps", blocks=[]),
             meeting_notes=MeetingNotes(sections=[])
         )
-        self.transcript_buffer = ""
+        # Buffered transcript pieces; joined once when the threshold is hit so
+        # appends stay O(1) instead of repeated string concatenation.
+        self._buffer_parts = []
+        self._buffer_len = 0
         self.llm_agent = None
         self.is_initialized = False
-        self.active_clients = []
+        self._ollama_client = None
+        self._queue = None
+        self._worker = None
+        # Optional local model raced against the primary provider; the first
+        # valid result wins and the loser is cancelled.
+        self._fallback_model = None
+        self._last_chunk_hash = None
+        # Chunks enqueued but not yet merged; owned by the event loop, so a
+        # plain int is safe and the stream endpoint can ask "anything left?"
+        # without touching asyncio.Queue internals.
+        self._pending_chunks = 0
+        # Key the current agent was built with; pooled reuse must rebuild
+        # when a caller supplies a different key (rotation via the frontend).
+        self._active_api_key = None
+        # Near-duplicate chunk cache; inert unless faiss/sentence-transformers
+        # are installed, so the exact-hash fast path remains the baseline.
+        self._semantic_cache = SemanticChunkCache()
 
     async def initialize(self, api_key: Optional[str] = None):
         if self.is_initialized:
@@ -57,126 +271,310 @@ class IncrementalSummarizer:
         llm = None
         
         try:
-            if self.model_provider == "claude":
-                effective_api_key = api_key or await self.db.get_api_key("claude")
-                if not effective_api_key: 
-                    logger.error("ANTHROPIC_API_KEY not found")
-                    raise ValueError("ANTHROPIC_API_KEY not set")
-                llm = AnthropicModel(self.model_name, provider=AnthropicProvider(api_key=effective_api_key))
-            elif self.model_provider == "groq":
-                effective_api_key = api_key or await self.db.get_api_key("groq")
-                if not effective_api_key:
-                    logger.error("GROQ_API_KEY not found")
-                    raise ValueError("GROQ_API_KEY not set")
-                llm = GroqModel(self.model_name, provider=GroqProvider(api_key=effective_api_key))
-            elif self.model_provider == "openai":
-                effective_api_key = api_key or await self.db.get_api_key("openai")
-                if not effective_api_key:
-                    logger.error("OPENAI_API_KEY not found")
-                    raise ValueError("OPENAI_API_KEY not set")
-                llm = OpenAIModel(self.model_name, provider=OpenAIProvider(api_key=effective_api_key))
-            elif self.model_provider == "openrouter":
-                effective_api_key = api_key or await self.db.get_api_key("openrouter")
-                if not effective_api_key:
-                    logger.error("OPENROUTER_API_KEY not found")
-                    raise ValueError("OPENROUTER_API_KEY not set")
-                # OpenRouter is OpenAI-compatible
-                llm = OpenAIModel(self.model_name, provider=OpenAIProvider(api_key=effective_api_key, base_url="https://openrouter.ai/api/v1"))
-            elif self.model_provider == "custom-openai":
-                # For custom-openai, we should ideally have the endpoint too.
-                # If not provided, we fallback to OpenAI default.
-                effective_api_key = api_key or await self.db.get_api_key("openai")
-                llm = OpenAIModel(self.model_name, provider=OpenAIProvider(api_key=effective_api_key))
-            elif self.model_provider == "ollama":
-                logger.info("Using Ollama AsyncClient for summarization")
-                pass
-            elif self.model_provider == "builtin-ai":
+            if self.model_provider == "builtin-ai":
                 logger.warning(f"⚠️ IncrementalSummarizer: 'builtin-ai' provider not yet implemented. Falling back to Ollama.")
                 self.model_provider = "ollama"
                 # Keep the original model name if it's likely an Ollama model, or use a default
                 if not self.model_name or self.model_name == "undefined":
                     self.model_name = "llama3.2:latest"
                 logger.info(f"🔄 Fallback configured: provider='ollama', model='{self.model_name}'")
+
+            if self.model_provider == "ollama":
+                logger.info("Using Ollama AsyncClient for summarization")
+            elif self.model_provider in _PROVIDERS:
+                build_model, key_provider, env_name, key_required = _PROVIDERS[self.model_provider]
+                effective_api_key = api_key or await _cached_api_key(self.db, key_provider)
+                if key_required and not effective_api_key:
+                    logger.error(f"{env_name} not found")
+                    raise ValueError(f"{env_name} not set")
+                self._active_api_key = effective_api_key
+                llm = build_model(effective_api_key, self.model_name, self._http_client)
             else:
                 logger.error(f"❌ Unsupported model provider: {self.model_provider}")
                 raise ValueError(f"Unsupported model provider: {self.model_provider}")
-            
-            if self.model_provider != "ollama":
+
+            # Fold any caller-provided static context into the session's system
+            # prompt. Assembled once here so every chunk reuses the identical
+            # prefix and provider-side prompt caches stay hot.
+            system_prompt = _PROMPT_PREFIX
+            if self.custom_prompt:
+                system_prompt += f"\n        **Additional Context:**\n        {self.custom_prompt}\n"
+            if self.static_system_prompt:
+                system_prompt += f"\n        {self.static_system_prompt}\n"
+            self._system_prompt = system_prompt
+
+            if self.model_provider == "ollama":
+                # Reuse one client (and its httpx connection pool) for the whole
+                # meeting so every chunk rides the same keep-alive connection.
+                ollama_host = os.getenv('OLLAMA_HOST', 'http://127.0.0.1:11434')
+                self._ollama_client = AsyncClient(host=ollama_host)
+            else:
                 if not llm:
                     raise ValueError(f"LLM object for provider '{self.model_provider}' could not be initialized.")
-                self.llm_agent = Agent(llm, result_type=SummaryResponse, result_retries=2)
+                # Static instructions travel as the agent's system prompt, with
+                # only the chunk in the user message, so providers that cache
+                # identical prompt prefixes (OpenAI-style endpoints) reuse the
+                # processed instructions across chunks. Anthropic would need
+                # explicit cache_control breakpoints on the system prompt,
+                # which the agent layer does not expose yet.
+                self.llm_agent = Agent(llm, result_type=SummaryResponse, result_retries=2,
+                                       system_prompt=self._system_prompt)
                 logger.info(f"🤖 Pydantic-AI Agent initialized for {self.model_provider}/{self.model_name}")
-                
+
+                # Optional: race a cheap local Ollama model against the cloud
+                # provider so one slow provider never blocks summary updates.
+                self._fallback_model = os.getenv('SUMMARIZER_FALLBACK_OLLAMA_MODEL')
+                if self._fallback_model:
+                    ollama_host = os.getenv('OLLAMA_HOST', 'http://127.0.0.1:11434')
+                    self._ollama_client = AsyncClient(host=ollama_host)
+                    logger.info(f"🏁 Fallback race enabled with local Ollama model '{self._fallback_model}'")
+
+            # Warm the connection pool now so the first chunk doesn't pay the
+            # DNS + TCP + TLS handshake on the user's critical path.
+            await self._prewarm_connection(llm)
+
+            # Summarization runs on a background consumer so the transcription
+            # path never waits on an LLM round-trip. The bounded queue applies
+            # backpressure if the LLM falls far behind.
+            self._queue = asyncio.Queue(maxsize=4)
+            self._worker = asyncio.create_task(self._consumer_loop())
+
             self.is_initialized = True
             logger.info(f"✨ Summarizer for meeting {self.meeting_id} initialized. Provider: {self.model_provider}, Model: {self.model_name}")
         except Exception as e:
             logger.error(f"Failed to initialize LLM: {str(e)}", exc_info=True)
             raise
 
+    def reset(self):
+        """Return the summarizer to an idle, reusable state between meetings.
+
+        Per-meeting state (rolling summary, buffers, queue, worker) is
+        discarded; provider clients and the agent are kept so a pooled
+        instance can skip their construction on the next meeting.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._queue = None
+        self.meeting_id = None
+        self.rolling_summary = SummaryResponse(
+            people=People(title="People", blocks=[]),
+            session_summary=Section(title="Session Summary", blocks=[]),
+            critical_deadlines=Section(title="Critical Deadlines", blocks=[]),
+            key_items_decisions=Section(title="Key Items & Decisions", blocks=[]),
+            immediate_action_items=Section(title="Immediate Action Items", blocks=[]),
+            next_steps=Section(title="Next Steps", blocks=[]),
+            meeting_notes=MeetingNotes(sections=[])
+        )
+        self._buffer_parts.clear()
+        self._buffer_len = 0
+        self._last_chunk_hash = None
+        self._pending_chunks = 0
+        self._semantic_cache = SemanticChunkCache()
+
+    async def configure(self, meeting_id: str, model_provider: str, model_name: str,
+                        custom_prompt: str = "", static_system_prompt: str = "",
+                        api_key: Optional[str] = None):
+        """(Re)bind a pooled instance to a new meeting.
+
+        When the provider, model and prompts are unchanged, the existing
+        clients, agent and system prompt are reused and only the per-meeting
+        consumer is restarted; otherwise everything is rebuilt via initialize.
+        """
+        # Resolve the key this meeting would run with even when the caller
+        # relies on the DB-stored one: rotation via /save-model-config
+        # invalidates the key cache, so this lookup notices a credential the
+        # pooled agent was not built with and forces the rebuild path.
+        effective_api_key = api_key
+        if effective_api_key is None and model_provider in _PROVIDERS:
+            effective_api_key = await _cached_api_key(self.db, _PROVIDERS[model_provider][1])
+        same_setup = (self.is_initialized
+                      and model_provider == self.model_provider
+                      and model_name == self.model_name
+                      and custom_prompt == self.custom_prompt
+                      and static_system_prompt == self.static_system_prompt
+                      and effective_api_key == self._active_api_key)
+        self.meeting_id = meeting_id
+        if same_setup:
+            logger.info(f"♻️ Reusing pooled summarizer for meeting {meeting_id} ({self.model_provider}/{self.model_name})")
+            self._queue = asyncio.Queue(maxsize=4)
+            self._worker = asyncio.create_task(self._consumer_loop())
+            return
+        # Different setup: tear down old clients and rebuild from scratch.
+        self.cleanup()
+        self.model_provider = model_provider
+        self.model_name = model_name
+        self.custom_prompt = custom_prompt
+        self.static_system_prompt = static_system_prompt
+        self.llm_agent = None
+        self._fallback_model = None
+        self.is_initialized = False
+        await self.initialize(api_key=api_key)
+
+    async def _prewarm_connection(self, llm=None):
+        """Open a keep-alive connection to the provider during initialize.
+
+        Best-effort: any failure is logged and ignored so a slow or offline
+        endpoint never blocks session start.
+        """
+        try:
+            if self._ollama_client is not None:
+                await self._ollama_client.list()
+                logger.info("🔥 Pre-warmed Ollama connection")
+            if llm is not None and hasattr(llm, 'client') and hasattr(llm.client, '_client'):
+                # llm.client is the provider SDK client; _client is its httpx pool
+                await llm.client._client.head(str(llm.client.base_url), timeout=5)
+                logger.info(f"🔥 Pre-warmed HTTPS connection to {self.model_provider}")
+        except Exception as e:
+            logger.debug("Connection pre-warm skipped: %s", e)
+
     async def add_transcript_chunk(self, new_text_chunk: str, chunk_size_threshold: int = 150) -> SummaryResponse:
-        logger.debug(f"Received new chunk: '{new_text_chunk}'， ")
+        logger.debug("Received new chunk: '%s'， ", new_text_chunk)
         if not self.is_initialized:
             raise RuntimeError("Summarizer is not initialized. Call `await .initialize()` first.")
 
-        self.transcript_buffer += " " + new_text_chunk
-        char_count = len(self.transcript_buffer)
-        logger.debug(f"Buffer char count: {char_count}, Threshold: {chunk_size_threshold}")
+        # Whitespace-only chunks carry nothing worth an LLM round-trip.
+        if not new_text_chunk or not new_text_chunk.strip():
+            return self.rolling_summary
+
+        self._buffer_parts.append(new_text_chunk)
+        self._buffer_len += len(new_text_chunk) + 1  # +1 for the joining space
+        char_count = self._buffer_len
+        logger.debug("Buffer char count: %d, Threshold: %d", char_count, chunk_size_threshold)
 
         if char_count >= chunk_size_threshold:
-            chunk_to_process = self.transcript_buffer
-            self.transcript_buffer = ""
-            logger.info(f"Processing a chunk of {char_count} characters for meeting {self.meeting_id}.")
-            await self._summarize_and_update(chunk_to_process)
-        
+            chunk_to_process = " ".join(self._buffer_parts)
+            self._buffer_parts.clear()
+            self._buffer_len = 0
+            # Retried/duplicated deliveries produce the exact same chunk text;
+            # one hash check is far cheaper than a redundant LLM call.
+            chunk_hash = hash(chunk_to_process)
+            if chunk_hash == self._last_chunk_hash:
+                logger.info(f"Skipping duplicate chunk for meeting {self.meeting_id}.")
+                return self.rolling_summary
+            self._last_chunk_hash = chunk_hash
+            logger.info(f"Queueing a chunk of {char_count} characters for meeting {self.meeting_id}.")
+            self._pending_chunks += 1
+            await self._queue.put(chunk_to_process)
+
+        # Return the latest snapshot immediately; the consumer task merges the
+        # queued chunk into the rolling summary in the background.
         return self.rolling_summary
 
-    async def _summarize_and_update(self, chunk_to_process: str):
-        prompt = f"""
-        Analyze the following meeting transcript chunk and extract key information into a JSON object.
+    async def add_transcript_chunk_stream(self, new_text_chunk: str, chunk_size_threshold: int = 150):
+        """Yield NDJSON summary states for a chunk as they become available.
 
-        **JSON Structure Requirement:**
-        {{
-          "MeetingName": "string or null",
-          "People": {{ "title": "People", "blocks": [] }},
-          "SessionSummary": {{
-            "title": "Notes",
-            "blocks": [ {{ "id": "string", "type": "bullet", "content": "提炼的核心信息", "color": "" }} ]
-          }},
-          "CriticalDeadlines": {{ "title": "Critical Deadlines", "blocks": [] }},
-          "KeyItemsDecisions": {{ "title": "Key Items & Decisions", "blocks": [] }},
-          "ImmediateActionItems": {{
-            "title": "Action Items",
-            "blocks": [ {{ "id": "string", "type": "bullet", "content": "任务描述", "color": "" }} ]
-          }},
-          "NextSteps": {{ "title": "Next Steps", "blocks": [] }},
-          "MeetingNotes": {{ "sections": [] }}
-        }}
+        The current snapshot goes out immediately, so the client's first byte
+        arrives in milliseconds instead of after the LLM round-trip. Once the
+        background consumer has drained the queue a second line follows with
+        the merged summary; when the chunk only buffered, both lines carry
+        the same state and the second is skipped.
+        """
+        snapshot = await self.add_transcript_chunk(new_text_chunk, chunk_size_threshold)
+        yield orjson.dumps({"event": "snapshot", "summary": snapshot.model_dump(mode="json")}) + b"\n"
+        if self._queue is None or self._pending_chunks == 0:
+            return
+        # Wait for the consumer to drain, but bail out if the worker stops
+        # underneath us (e.g. a concurrent /v2/summarize/end cancels it) —
+        # joining then would wait forever on work nobody will finish.
+        worker = self._worker
+        if worker is None:
+            return
+        join_task = asyncio.create_task(self._queue.join())
+        done, _ = await asyncio.wait({join_task, worker}, return_when=asyncio.FIRST_COMPLETED)
+        if join_task not in done:
+            join_task.cancel()
+            return
+        yield orjson.dumps({"event": "updated", "summary": self.rolling_summary.model_dump(mode="json")}) + b"\n"
 
-        **Instructions:**
-        1. Use "SessionSummary" for **Notes**: 提炼总结当前内容的核心信息，保持简洁。
-        2. Use "ImmediateActionItems" for **Action Items**: 识别待办任务：只有当某人要完成某项任务时才算是待办任务。必须包含描述，若有负责人或截止日期请在任务描述后添加，若没有则只包含描述。
-        3. 所有回答必须使用 **中文**。
-        4. 只返回 JSON 对象，不要有任何解释文字。
-        5. 其他不相关的字段（People, NextSteps等）请保持 "blocks" 为空数组。
+    async def _consumer_loop(self):
+        """Drain queued transcript chunks and feed them to the LLM in batches."""
+        while True:
+            chunk = await self._queue.get()
+            batch = [chunk]
+            total_len = len(chunk)
+            # Brief coalesce window so a burst of small chunks lands in one
+            # LLM call, then a non-blocking drain of whatever is pending.
+            await asyncio.sleep(_COALESCE_DELAY_SECONDS)
+            while not self._queue.empty() and total_len < _MAX_BATCH_CHARS:
+                extra = self._queue.get_nowait()
+                batch.append(extra)
+                total_len += len(extra)
+            if len(batch) > 1:
+                logger.info(f"Coalesced {len(batch)} pending chunks ({total_len} chars) into one LLM call for meeting {self.meeting_id}.")
+            try:
+                await self._summarize_and_update("\n---\n".join(batch))
+            except Exception as e:
+                logger.error(f"Consumer loop error for meeting {self.meeting_id}: {e}", exc_info=True)
+            finally:
+                self._pending_chunks -= len(batch)
+                for _ in batch:
+                    self._queue.task_done()
 
-        **Transcript Chunk:**
-        ---
-        {chunk_to_process}
-        ---
+    async def _run_llm(self, chunk_to_process: str):
+        """Run one summarization request against the configured provider."""
+        if self.model_provider == "ollama":
+            async with _provider_semaphore("ollama"):
+                return await self.chat_ollama_model(self.model_name, chunk_to_process)
+        # Instructions already live in the agent's system prompt; the user
+        # message carries only the chunk so the cacheable prefix never varies.
+        prompt = _PROMPT_CHUNK_HEADER + chunk_to_process + _PROMPT_SUFFIX
+        if not self.llm_agent:
+            raise RuntimeError("LLM agent is not initialized for this provider.")
+        async with _provider_semaphore(self.model_provider):
+            agent_response = await self.llm_agent.run(prompt)
+        if hasattr(agent_response, 'data') and isinstance(agent_response.data, SummaryResponse):
+            return agent_response.data
+        elif isinstance(agent_response, SummaryResponse):
+            return agent_response
+        return None
+
+    async def _run_fallback(self, chunk_to_process: str):
+        """Run the local fallback model under the shared Ollama limit."""
+        async with _provider_semaphore("ollama"):
+            return await self.chat_ollama_model(self._fallback_model, chunk_to_process)
+
+    async def _run_llm_with_fallback(self, chunk_to_process: str):
+        """Race the primary provider against the local fallback model.
+
+        The first task to finish with a valid SummaryResponse wins; everything
+        still pending is cancelled so we never pay for both responses.
         """
+        tasks = [
+            asyncio.create_task(self._run_llm(chunk_to_process)),
+            asyncio.create_task(self._run_fallback(chunk_to_process)),
+        ]
+        chunk_summary = None
         try:
-            logger.debug(f"Calling LLM for meeting {self.meeting_id} with a new chunk.")
-            chunk_summary = None
-            if self.model_provider == "ollama":
-                chunk_summary = await self.chat_ollama_model(self.model_name, prompt)
+            while tasks and chunk_summary is None:
+                done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        logger.warning(f"Provider task failed during fallback race: {task.exception()}")
+                    elif task.result() is not None:
+                        chunk_summary = task.result()
+                        break
+                tasks = list(pending)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return chunk_summary
+
+    async def _summarize_and_update(self, chunk_to_process: str):
+        try:
+            # Near-duplicate chunks (re-transcribed tails, silence padding)
+            # resolve from the semantic cache without touching the LLM.
+            if self._semantic_cache.enabled:
+                cached_summary = await asyncio.to_thread(self._semantic_cache.get, chunk_to_process)
+                if cached_summary is not None:
+                    logger.info(f"♻️ Reusing cached summary for near-duplicate chunk in meeting {self.meeting_id}")
+                    return
+
+            logger.debug("Calling LLM for meeting %s with a new chunk.", self.meeting_id)
+            if self._fallback_model:
+                chunk_summary = await self._run_llm_with_fallback(chunk_to_process)
             else:
-                if not self.llm_agent:
-                    raise RuntimeError("LLM agent is not initialized for this provider.")
-                agent_response = await self.llm_agent.run(prompt)
-                if hasattr(agent_response, 'data') and isinstance(agent_response.data, SummaryResponse):
-                    chunk_summary = agent_response.data
-                elif isinstance(agent_response, SummaryResponse):
-                    chunk_summary = agent_response
+                chunk_summary = await self._run_llm(chunk_to_process)
 
             if not chunk_summary:
                 logger.warning(f"LLM returned no valid summary for chunk in meeting {self.meeting_id}")
@@ -186,18 +584,12 @@ class IncrementalSummarizer:
             if chunk_summary.meeting_name and not self.rolling_summary.meeting_name:
                 self.rolling_summary.meeting_name = chunk_summary.meeting_name
             
-            # Use a helper to merge sections
-            def merge_section(rolling_section, chunk_section):
-                if chunk_section and chunk_section.blocks:
-                    rolling_section.blocks.extend(chunk_section.blocks)
-
-            merge_section(self.rolling_summary.people, chunk_summary.people)
-            merge_section(self.rolling_summary.session_summary, chunk_summary.session_summary)
-            merge_section(self.rolling_summary.critical_deadlines, chunk_summary.critical_deadlines)
-            merge_section(self.rolling_summary.key_items_decisions, chunk_summary.key_items_decisions)
-            merge_section(self.rolling_summary.immediate_action_items, chunk_summary.immediate_action_items)
-            merge_section(self.rolling_summary.next_steps, chunk_summary.next_steps)
-            
+            # Merge each populated section's blocks into the rolling summary
+            for attr in _SECTION_ATTRS:
+                src = getattr(chunk_summary, attr)
+                if src and src.blocks:
+                    getattr(self.rolling_summary, attr).blocks.extend(src.blocks)
+
             # Special handling for nested MeetingNotes
             if chunk_summary.meeting_notes and chunk_summary.meeting_notes.sections:
                 if not self.rolling_summary.meeting_notes:
@@ -205,33 +597,46 @@ class IncrementalSummarizer:
                 self.rolling_summary.meeting_notes.sections.extend(chunk_summary.meeting_notes.sections)
 
 
+            if self._semantic_cache.enabled:
+                await asyncio.to_thread(self._semantic_cache.put, chunk_to_process, chunk_summary)
+
             logger.info(f"✅ Successfully merged new chunk into rolling summary for {self.meeting_id}")
-            # Debug: Print current summary state
-            logger.debug(f"📊 Current Summary State for {self.meeting_id}:")
-            logger.debug(f"  - People: {len(self.rolling_summary.people.blocks)} blocks")
-            logger.debug(f"  - Session Summary: {len(self.rolling_summary.session_summary.blocks)} blocks")
-            logger.debug(f"  - Action Items: {len(self.rolling_summary.immediate_action_items.blocks)} blocks")
-            if self.rolling_summary.session_summary.blocks:
-                logger.debug(f"  - Latest Summary Text: {self.rolling_summary.session_summary.blocks[-1].content[:100]}...")
+            # Debug: Print current summary state (guarded so the block-count
+            # and slicing work disappears entirely at production log levels)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📊 Current Summary State for %s:", self.meeting_id)
+                logger.debug("  - People: %d blocks", len(self.rolling_summary.people.blocks))
+                logger.debug("  - Session Summary: %d blocks", len(self.rolling_summary.session_summary.blocks))
+                logger.debug("  - Action Items: %d blocks", len(self.rolling_summary.immediate_action_items.blocks))
+                if self.rolling_summary.session_summary.blocks:
+                    logger.debug("  - Latest Summary Text: %s...", self.rolling_summary.session_summary.blocks[-1].content[:100])
         except Exception as e:
             logger.error(f"Error updating summary for meeting {self.meeting_id}: {e}", exc_info=True)
 
-    async def chat_ollama_model(self, model_name: str, prompt: str):
-        message = {'role': 'system', 'content': prompt}
-        ollama_host = os.getenv('OLLAMA_HOST', 'http://127.0.0.1:11434')
-        client = AsyncClient(host=ollama_host)
-        self.active_clients.append(client)
+    async def chat_ollama_model(self, model_name: str, chunk: str):
+        # The static instructions go in the system message and the chunk in the
+        # user message, so Ollama can cache the shared prompt prefix.
+        messages = [
+            {'role': 'system', 'content': self._system_prompt},
+            {'role': 'user', 'content': _PROMPT_CHUNK_HEADER + chunk + _PROMPT_SUFFIX},
+        ]
+        if not self._ollama_client:
+            raise RuntimeError("Ollama client is not initialized. Call `await .initialize()` first.")
         try:
-            # Use format='json' to guide the model
-            response = await client.chat(model=model_name, messages=[message], format="json")
-            full_response = response['message']['content'].strip()
+            # Use format='json' to guide the model; stream tokens as they are
+            # generated so client-side accumulation overlaps with generation
+            # instead of waiting for the full response to finish.
+            response = await self._ollama_client.chat(model=model_name, messages=messages, format="json", stream=True)
+            parts = []
+            async for part in response:
+                parts.append(part['message']['content'])
+            full_response = "".join(parts).strip()
 
             if not full_response:
                 logger.warning("Ollama returned an empty response.")
                 return None
             
             try:
-                import json
                 # Helper to strip markdown and extract JSON
                 def extract_json(text):
                     text = text.strip()
@@ -243,8 +648,9 @@ class IncrementalSummarizer:
                     return text
 
                 clean_json_str = extract_json(full_response)
-                logger.debug(f"🔍 [Ollama] Extracted JSON string (first 100 chars): {clean_json_str[:100]}...")
-                raw_data = json.loads(clean_json_str)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🔍 [Ollama] Extracted JSON string (first 100 chars): %s...", clean_json_str[:100])
+                raw_data = orjson.loads(clean_json_str)
 
                 # Normalize keys (Ollama sometimes changes casing or returns flat structure)
                 # Ensure all required top-level keys exist
@@ -252,7 +658,8 @@ class IncrementalSummarizer:
                 
                 # Case-insensitive key matching
                 normalized_data = {}
-                logger.debug(f"🔍 [Ollama] Raw JSON keys: {list(raw_data.keys())}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("🔍 [Ollama] Raw JSON keys: %s", list(raw_data.keys()))
                 for rk in required_keys:
                     # Find if the raw_data has this key (case-insensitive)
                     found_key = next((k for k in raw_data.keys() if k.lower() == rk.lower()), None)
@@ -273,40 +680,19 @@ class IncrementalSummarizer:
                     normalized_data["MeetingName"] = None
                 
                 # Fix block types and ensure structure
-                def fix_structure(obj, key_name=None):
-                    if isinstance(obj, dict):
-                        # Fix block types
-                        if 'content' in obj:
-                            # It's likely a block
-                            # 1. Ensure type exists and is valid
-                            valid_types = ['bullet', 'heading1', 'heading2', 'text']
-                            if 'type' not in obj or obj['type'] not in valid_types:
-                                obj['type'] = 'text'
-                            
-                            # 2. Ensure ID exists
-                            if 'id' not in obj or not obj['id']:
-                                import uuid
-                                obj['id'] = f"block-{uuid.uuid4().hex[:8]}"
-                            
-                            # 3. Ensure color exists
-                            if 'color' not in obj:
-                                obj['color'] = ""
-                        
-                        for k, v in obj.items():
-                            fix_structure(v, k)
-                    elif isinstance(obj, list):
-                        for item in obj:
-                            fix_structure(item)
-
-                fix_structure(normalized_data)
+                _fix_structure(normalized_data)
                 
-                # Now validate with Pydantic
-                summary = SummaryResponse.model_validate(normalized_data)
+                # Post-normalization data is trusted; construct directly and
+                # keep the strict validation path behind a debug flag.
+                if _STRICT_VALIDATION:
+                    summary = SummaryResponse.model_validate(normalized_data)
+                else:
+                    summary = _construct_summary(normalized_data)
                 logger.info(f"✅ [Ollama] Validated SummaryResponse. Sections with content: {[k for k, v in normalized_data.items() if isinstance(v, dict) and v.get('blocks')]}")
                 return summary
             except Exception as e:
                 logger.error(f"Error parsing/validating Ollama response: {e}")
-                logger.debug(f"Raw response was: {full_response}")
+                logger.debug("Raw response was: %s", full_response)
                 raise e
         except asyncio.CancelledError:
             logger.info("Ollama request was cancelled during shutdown")
@@ -314,29 +700,37 @@ class IncrementalSummarizer:
         except Exception as e:
             logger.error(f"Error in Ollama chat: {e}")
             raise
-        finally:
-            if client in self.active_clients:
-                self.active_clients.remove(client)
 
     async def get_final_summary(self) -> SummaryResponse:
-        if self.transcript_buffer.strip():
+        remaining = " ".join(self._buffer_parts)
+        if remaining.strip():
             logger.info(f"Processing final remaining chunk for meeting {self.meeting_id}...")
-            await self._summarize_and_update(self.transcript_buffer)
-            self.transcript_buffer = ""
+            self._pending_chunks += 1
+            await self._queue.put(remaining)
+        self._buffer_parts.clear()
+        self._buffer_len = 0
+        # Wait until the consumer has drained everything, then stop it.
+        if self._queue is not None:
+            await self._queue.join()
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
         return self.rolling_summary
     
     def cleanup(self):
         logger.info(f"Cleaning up IncrementalSummarizer for meeting {self.meeting_id}")
         try:
-            if hasattr(self, 'active_clients') and self.active_clients:
-                logger.info(f"Terminating {len(self.active_clients)} active Ollama client sessions")
-                for client in self.active_clients:
-                    try:
-                        if hasattr(client, '_client') and hasattr(client._client, 'close'):
-                            asyncio.create_task(client._client.aclose())
-                    except Exception as client_error:
-                        logger.error(f"Error closing Ollama client: {client_error}", exc_info=True)
-                self.active_clients.clear()
-                logger.info("All Ollama client sessions terminated")
+            if self._worker is not None:
+                self._worker.cancel()
+                self._worker = None
+            if self._ollama_client is not None:
+                logger.info("Closing shared Ollama client session")
+                try:
+                    if hasattr(self._ollama_client, '_client') and hasattr(self._ollama_client._client, 'aclose'):
+                        asyncio.create_task(self._ollama_client._client.aclose())
+                except Exception as client_error:
+                    logger.error(f"Error closing Ollama client: {client_error}", exc_info=True)
+                self._ollama_client = None
+                logger.info("Ollama client session terminated")
         except Exception as e:
             logger.error(f"Error during IncrementalSummarizer cleanup: {str(e)}", exc_info=True)
\ No newline at end of file
@@ -1,26 +1,36 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 from typing import Optional, List
+import asyncio
 import logging
+import multiprocessing
+import os
+from collections import deque
+from cachetools import TTLCache
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+import httpx
 from db import DatabaseManager
 import json
-from threading import Lock
+import secrets
 from transcript_processor import TranscriptProcessor, SummaryResponse
-from incremental_summarizer import IncrementalSummarizer
+from incremental_summarizer import IncrementalSummarizer, invalidate_api_key_cache
 import time
 
 # Load environment variables
 load_dotenv()
 
-# Configure logger
+# Configure logger. Level comes from LOG_LEVEL (default INFO) so the
+# isEnabledFor guards on the hot path actually skip their work in
+# production; set LOG_LEVEL=DEBUG to get the verbose diagnostics back.
+LOG_LEVEL = getattr(logging, os.getenv('LOG_LEVEL', 'INFO').upper(), logging.INFO)
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
+logger.setLevel(LOG_LEVEL)
 console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.DEBUG)
+console_handler.setLevel(LOG_LEVEL)
 formatter = logging.Formatter(
     '%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d - %(funcName)s()] - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
@@ -29,10 +39,38 @@ console_handler.setFormatter(formatter)
 if not logger.handlers:
     logger.addHandler(console_handler)
 
+# Global instances
+db = DatabaseManager()
+
+# Shared client for all outbound LLM calls; created in the lifespan. Keeping
+# one keep-alive connection pool across sessions avoids a fresh TCP+TLS
+# handshake per meeting and caps total outbound connection concurrency.
+llm_http_client: Optional[httpx.AsyncClient] = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources for the app's lifetime and tear them down once."""
+    global llm_http_client
+    logger.info("API starting up.")
+    await db.init_pool()
+    llm_http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+        timeout=httpx.Timeout(120.0, connect=10.0)
+    )
+    expiry_task = asyncio.create_task(_expire_stale_summarizers())
+    yield
+    logger.info("API shutting down.")
+    expiry_task.cancel()
+    await llm_http_client.aclose()
+    llm_http_client = None
+    await db.close_pool()
+
 app = FastAPI(
     title="Meeting Summarizer API",
     description="API for processing and summarizing meeting transcripts",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -45,9 +83,96 @@ app.add_middleware(
     max_age=3600,
 )
 
-# Global instances
-db = DatabaseManager()
-active_summarizers = {}
+# Active summarization sessions. Bounded with a TTL so sessions abandoned by
+# crashed or disconnected clients (start without a matching end) are evicted
+# and cleaned up instead of pinning their summarizer in RAM forever. Writing
+# to a key refreshes its TTL, so live meetings stay resident.
+SUMMARIZER_CACHE_MAXSIZE = 256
+SUMMARIZER_CACHE_TTL_SECONDS = 3600
+
+class _SummarizerCache(TTLCache):
+    """TTLCache that cleans up summarizers it drops.
+
+    TTLCache expires entries implicitly on every write (cache writes call
+    expire() internally and discard the result), so the cleanup hook must
+    live in expire() itself — a periodic sweep alone would miss any session
+    whose TTL lapses between sweeps and is then dropped by a write.
+    """
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for meeting_id, summarizer in expired:
+            if summarizer is _SUMMARIZER_PENDING:
+                continue
+            logger.warning(f"⏰ Expiring idle summarizer session {meeting_id}")
+            try:
+                summarizer.cleanup()
+            except Exception as e:
+                logger.error(f"Error cleaning up expired summarizer {meeting_id}: {e}", exc_info=True)
+        return expired
+
+    def popitem(self):
+        meeting_id, summarizer = super().popitem()
+        if summarizer is _SUMMARIZER_PENDING:
+            return meeting_id, summarizer
+        logger.warning(f"⏰ Evicting summarizer session {meeting_id} (cache full)")
+        try:
+            summarizer.cleanup()
+        except Exception as e:
+            logger.error(f"Error cleaning up evicted summarizer {meeting_id}: {e}", exc_info=True)
+        return meeting_id, summarizer
+
+active_summarizers = _SummarizerCache(maxsize=SUMMARIZER_CACHE_MAXSIZE, ttl=SUMMARIZER_CACHE_TTL_SECONDS)
+
+# Guards check-then-set on active_summarizers so two concurrent start
+# requests for the same meeting cannot both pass the existence check.
+_summarizers_lock = asyncio.Lock()
+_SUMMARIZER_PENDING = object()
+
+class SummarizerPool:
+    """Reuses idle IncrementalSummarizer instances across meetings.
+
+    A summarizer keeps provider HTTP clients and its agent alive between
+    meetings, so pooling one costs a reset instead of re-running client
+    construction and the connection pre-warm on every /v2/summarize/start.
+    """
+    def __init__(self, maxlen: int = 32):
+        self._pool = deque(maxlen=maxlen)
+
+    def acquire(self):
+        """Pop an idle summarizer, or None when the pool is empty."""
+        try:
+            return self._pool.pop()
+        except IndexError:
+            return None
+
+    def release(self, summarizer):
+        """Reset a finished summarizer and return it to the pool."""
+        try:
+            summarizer.reset()
+        except Exception as e:
+            logger.error(f"Error resetting summarizer for pooling, discarding it: {e}", exc_info=True)
+            summarizer.cleanup()
+            return
+        if len(self._pool) == self._pool.maxlen:
+            # deque would silently drop the oldest entry; close it properly.
+            self._pool.popleft().cleanup()
+        self._pool.append(summarizer)
+
+summarizer_pool = SummarizerPool()
+
+async def _expire_stale_summarizers():
+    """Periodically expire idle sessions so a quiet cache still gets swept.
+
+    Cleanup itself happens inside _SummarizerCache.expire, which also runs
+    on every cache write; this task only guarantees a bounded delay when no
+    writes arrive.
+    """
+    while True:
+        await asyncio.sleep(60)
+        try:
+            active_summarizers.expire()
+        except Exception as e:
+            logger.error(f"Summarizer expiry sweep failed: {e}", exc_info=True)
 
 # --- Pydantic Models ---
 
@@ -109,6 +234,8 @@ class IncrementalStartRequest(BaseModel):
     model_provider: str
     model_name: str
     custom_prompt: Optional[str] = ""
+    # Extra static context appended to the cacheable system-prompt prefix
+    static_system_prompt: Optional[str] = ""
     api_key: Optional[str] = None
 
 class IncrementalAddChunkRequest(BaseModel):
@@ -135,22 +262,40 @@ class GetApiKeyRequest(BaseModel):
 async def api_v2_start_summarization(request: IncrementalStartRequest):
     meeting_id = request.meeting_id
     logger.info(f"🚀 [Start] Received summary start request for {meeting_id}. Provider: {request.model_provider}, Model: {request.model_name}")
-    if meeting_id in active_summarizers:
-        logger.warning(f"⚠️ [Start] Summarization already in progress for {meeting_id}")
-        raise HTTPException(status_code=409, detail=f"Summarization for meeting {meeting_id} is already in progress.")
+    async with _summarizers_lock:
+        if meeting_id in active_summarizers:
+            logger.warning(f"⚠️ [Start] Summarization already in progress for {meeting_id}")
+            raise HTTPException(status_code=409, detail=f"Summarization for meeting {meeting_id} is already in progress.")
+        # Reserve the slot before the (slow) initialize so a concurrent
+        # start for the same meeting gets the 409 instead of racing us.
+        active_summarizers[meeting_id] = _SUMMARIZER_PENDING
     try:
-        summarizer = IncrementalSummarizer(
-            meeting_id=meeting_id,
-            model_provider=request.model_provider,
-            model_name=request.model_name,
-            custom_prompt=request.custom_prompt,
-            db_manager=db
-        )
-        await summarizer.initialize(api_key=request.api_key)
+        summarizer = summarizer_pool.acquire()
+        if summarizer is not None:
+            await summarizer.configure(
+                meeting_id,
+                request.model_provider,
+                request.model_name,
+                custom_prompt=request.custom_prompt,
+                static_system_prompt=request.static_system_prompt,
+                api_key=request.api_key
+            )
+        else:
+            summarizer = IncrementalSummarizer(
+                meeting_id=meeting_id,
+                model_provider=request.model_provider,
+                model_name=request.model_name,
+                custom_prompt=request.custom_prompt,
+                db_manager=db,
+                static_system_prompt=request.static_system_prompt,
+                http_client=llm_http_client
+            )
+            await summarizer.initialize(api_key=request.api_key)
         active_summarizers[meeting_id] = summarizer
         logger.info(f"✅ [Start] Initialized summarizer for {meeting_id} using {request.model_provider}/{request.model_name}")
-        return JSONResponse(status_code=200, content={"message": "Summarization session started successfully."})
+        return ORJSONResponse(status_code=200, content={"message": "Summarization session started successfully."})
     except Exception as e:
+        active_summarizers.pop(meeting_id, None)
         logger.error(f"❌ [Start] Failed to start for {meeting_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -158,50 +303,69 @@ async def api_v2_start_summarization(request: IncrementalStartRequest):
 async def api_v2_add_chunk(request: IncrementalAddChunkRequest):
     meeting_id = request.meeting_id
     summarizer = active_summarizers.get(meeting_id)
-    if not summarizer:
-        logger.error(f"❌ [AddChunk] 404 Not Found: {meeting_id}. Active sessions: {list(active_summarizers.keys())}")
+    if not summarizer or summarizer is _SUMMARIZER_PENDING:
+        logger.error("❌ [AddChunk] 404 Not Found: %s. Active sessions: %s", meeting_id, list(active_summarizers.keys()))
         raise HTTPException(status_code=404, detail=f"No active summarization session found for meeting {meeting_id}.")
     try:
-        logger.debug(f"📥 [AddChunk] Adding chunk to {meeting_id} (Length: {len(request.text_chunk)})")
+        logger.debug("📥 [AddChunk] Adding chunk to %s (Length: %d)", meeting_id, len(request.text_chunk))
+        # Re-insert to refresh the session's TTL while the meeting is live
+        active_summarizers[meeting_id] = summarizer
         updated_summary = await summarizer.add_transcript_chunk(request.text_chunk)
         
-        # Debug: Print the data structure being sent
-        from fastapi.encoders import jsonable_encoder
-        json_data = jsonable_encoder(updated_summary)
-        logger.debug(f"📤 [AddChunk] Returning JSON structure (keys): {list(json_data.keys())}")
-        
+        # Debug: Print the data structure being sent (model_dump walks the
+        # whole summary tree, so skip it entirely unless DEBUG is on)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📤 [AddChunk] Returning JSON structure (keys): %s", list(updated_summary.model_dump().keys()))
+
         return updated_summary
     except Exception as e:
         logger.error(f"❌ [AddChunk] Failed for {meeting_id}: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/v2/summarize/add_chunk_stream")
+async def api_v2_add_chunk_stream(request: IncrementalAddChunkRequest):
+    """Streaming variant of add_chunk: NDJSON with the current snapshot first,
+    then the merged summary once the background consumer catches up."""
+    meeting_id = request.meeting_id
+    summarizer = active_summarizers.get(meeting_id)
+    if not summarizer or summarizer is _SUMMARIZER_PENDING:
+        logger.error("❌ [AddChunkStream] 404 Not Found: %s. Active sessions: %s", meeting_id, list(active_summarizers.keys()))
+        raise HTTPException(status_code=404, detail=f"No active summarization session found for meeting {meeting_id}.")
+    # Re-insert to refresh the session's TTL while the meeting is live
+    active_summarizers[meeting_id] = summarizer
+    return StreamingResponse(
+        summarizer.add_transcript_chunk_stream(request.text_chunk),
+        media_type="application/x-ndjson"
+    )
+
 @app.post("/v2/summarize/end")
 async def api_v2_end_summarization(request: IncrementalEndRequest):
     meeting_id = request.meeting_id
     summarizer = active_summarizers.get(meeting_id)
-    if not summarizer:
+    if not summarizer or summarizer is _SUMMARIZER_PENDING:
         logger.info(f"ℹ️ [End] Session {meeting_id} not found in memory. It may have already been closed.")
         # Attempt to return successful status if the process is already in DB
-        return JSONResponse(status_code=200, content={"message": "Summarization session already ended or not found.", "status": "already_closed"})
+        return ORJSONResponse(status_code=200, content={"message": "Summarization session already ended or not found.", "status": "already_closed"})
     try:
         logger.info(f"🏁 [End] Ending summarization for {meeting_id}")
         final_summary = await summarizer.get_final_summary()
         
-        # Debug: Print final summary content
-        logger.info(f"📊 [End] Final Summary for {meeting_id}:")
-        logger.info(f"  - Title: {final_summary.meeting_name}")
-        logger.info(f"  - Summary Blocks: {len(final_summary.session_summary.blocks)}")
-        if final_summary.session_summary.blocks:
+        # Debug: Print final summary content (block slicing is skipped
+        # entirely when INFO records would be discarded anyway)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("📊 [End] Final Summary for %s:", meeting_id)
+            logger.info("  - Title: %s", final_summary.meeting_name)
+            logger.info("  - Summary Blocks: %d", len(final_summary.session_summary.blocks))
             for i, block in enumerate(final_summary.session_summary.blocks):
-                logger.info(f"    [{i}] {block.content[:100]}...")
+                logger.info("    [%d] %s...", i, block.content[:100])
 
         process_id = await db.create_process(meeting_id)
         await db.update_process(process_id, status="completed", result=final_summary.model_dump_json())
-        summarizer.cleanup()
         if meeting_id in active_summarizers:
             del active_summarizers[meeting_id]
+        summarizer_pool.release(summarizer)
         logger.info(f"💾 [End] Saved final summary for {meeting_id}")
-        return JSONResponse(status_code=200, content={"message": "Summarization session ended successfully.", "final_summary": final_summary.model_dump()})
+        return ORJSONResponse(status_code=200, content={"message": "Summarization session ended successfully.", "final_summary": final_summary.model_dump(mode="json")})
     except Exception as e:
         logger.error(f"❌ [End] Failed for {meeting_id}: {e}", exc_info=True)
         if meeting_id in active_summarizers:
@@ -212,11 +376,13 @@ async def api_v2_end_summarization(request: IncrementalEndRequest):
 
 # --- Other Endpoints ---
 
-@app.get("/get-meetings", response_model=List[MeetingResponse])
+@app.get("/get-meetings")
 async def get_meetings():
     try:
-        meetings = await db.get_all_meetings()
-        return [{"id": meeting["id"], "title": meeting["title"]} for meeting in meetings]
+        # DB rows are already the response shape; skip Pydantic re-validation
+        # and let orjson serialize the list-of-dicts directly.
+        meetings = await db.get_all_meetings_minimal()
+        return ORJSONResponse(content=meetings)
     except Exception as e:
         logger.error(f"Error getting meetings: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -267,9 +433,9 @@ async def get_summary(meeting_id: str):
     try:
         result = await db.get_transcript_data(meeting_id)
         if not result:
-            return JSONResponse(status_code=404, content={"status": "error", "error": "Meeting ID not found"})
+            return ORJSONResponse(status_code=404, content={"status": "error", "error": "Meeting ID not found"})
         # ... (The rest of the logic can stay as it reads from the DB)
-        return JSONResponse(status_code=200, content=result)
+        return ORJSONResponse(status_code=200, content=result)
     except Exception as e:
         logger.error(f"Error getting summary for {meeting_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -279,7 +445,9 @@ async def get_summary(meeting_id: str):
 async def save_transcript(request: SaveTranscriptRequest):
     try:
         logger.info(f"Received save-transcript request for meeting: {request.meeting_title}")
-        meeting_id = request.meeting_id or f"meeting-{int(time.time() * 1000)}"
+        # time_ns avoids the float round-trip; the random suffix keeps ids
+        # unique when bursty saves land in the same millisecond.
+        meeting_id = request.meeting_id or f"meeting-{time.time_ns() // 1_000_000}-{secrets.token_hex(3)}"
         real_time_summary_str = json.dumps(request.real_time_summary) if request.real_time_summary else None
         
         await db.save_meeting(
@@ -289,16 +457,11 @@ async def save_transcript(request: SaveTranscriptRequest):
             real_time_summary=real_time_summary_str
         )
         
-        for transcript in request.transcripts:
-            await db.save_meeting_transcript(
-                meeting_id=meeting_id,
-                transcript=transcript.text,
-                timestamp=transcript.timestamp,
-                summary="", action_items="", key_points="",
-                audio_start_time=transcript.audio_start_time,
-                audio_end_time=transcript.audio_end_time,
-                duration=transcript.duration
-            )
+        rows = [
+            (t.text, t.timestamp, "", "", "", t.audio_start_time, t.audio_end_time, t.duration)
+            for t in request.transcripts
+        ]
+        await db.save_meeting_transcripts_bulk(meeting_id, rows)
         return {"status": "success", "message": "Transcript saved successfully", "meeting_id": meeting_id}
     except Exception as e:
         logger.error(f"Error saving transcript: {str(e)}", exc_info=True)
@@ -306,14 +469,23 @@ async def save_transcript(request: SaveTranscriptRequest):
 
 # ... (other non-conflicting endpoints like /get-model-config, etc. can be kept) ...
 
+# Configs change at human timescale but are polled on every frontend refresh;
+# a short TTL keeps each poll a dict lookup instead of two SQLite reads while
+# still bounding staleness. Saves invalidate immediately.
+_config_cache = TTLCache(maxsize=4, ttl=30)
+
 @app.get("/get-model-config")
 async def get_model_config():
     """Get the current model configuration"""
+    model_config = _config_cache.get("model")
+    if model_config is not None:
+        return model_config
     model_config = await db.get_model_config()
     if model_config:
         api_key = await db.get_api_key(model_config["provider"])
         if api_key != None:
             model_config["apiKey"] = api_key
+    _config_cache["model"] = model_config
     return model_config
 
 @app.post("/save-model-config")
@@ -322,16 +494,22 @@ async def save_model_config(request: SaveModelConfigRequest):
     await db.save_model_config(request.provider, request.model, request.whisperModel)
     if request.apiKey != None:
         await db.save_api_key(request.apiKey, request.provider)
-    return {"status": "success", "message": "Model configuration saved successfully"}  
+        invalidate_api_key_cache(request.provider)
+    _config_cache.pop("model", None)
+    return {"status": "success", "message": "Model configuration saved successfully"}
 
 @app.get("/get-transcript-config")
 async def get_transcript_config():
     """Get the current transcript configuration"""
+    transcript_config = _config_cache.get("transcript")
+    if transcript_config is not None:
+        return transcript_config
     transcript_config = await db.get_transcript_config()
     if transcript_config:
         transcript_api_key = await db.get_transcript_api_key(transcript_config["provider"])
         if transcript_api_key != None:
             transcript_config["apiKey"] = transcript_api_key
+    _config_cache["transcript"] = transcript_config
     return transcript_config
 
 @app.post("/save-transcript-config")
@@ -340,6 +518,7 @@ async def save_transcript_config(request: SaveTranscriptConfigRequest):
     await db.save_transcript_config(request.provider, request.model)
     if request.apiKey != None:
         await db.save_transcript_api_key(request.apiKey, request.provider)
+    _config_cache.pop("transcript", None)
     return {"status": "success", "message": "Transcript configuration saved successfully"}
 
 @app.post("/get-api-key")
@@ -370,16 +549,29 @@ async def save_meeting_summary(data: MeetingSummaryUpdate):
 async def search_transcripts(request: SearchRequest):
     try:
         results = await db.search_transcripts(request.query)
-        return JSONResponse(content=results)
+        return ORJSONResponse(content=results)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("API shutting down.")
-    # No processor to clean up
-
 if __name__ == "__main__":
-    import multiprocessing
+    # Must run before any other multiprocessing work when frozen; uvicorn's
+    # pre-fork worker spawn goes through multiprocessing on Windows.
     multiprocessing.freeze_support()
-    uvicorn.run("main:app", host="0.0.0.0", port=5167)
\ No newline at end of file
+    # uvloop roughly doubles event-loop throughput and httptools speeds up
+    # request parsing; both are optional (not available on Windows) so fall
+    # back to uvicorn's defaults when they are not installed.
+    loop_impl, http_impl = "auto", "auto"
+    try:
+        import uvloop  # noqa: F401
+        import httptools  # noqa: F401
+        loop_impl, http_impl = "uvloop", "httptools"
+    except ImportError:
+        logger.info("uvloop/httptools not available, using default event loop")
+    # Workers default to 1: active_summarizers and the summarizer pool are
+    # in-process, so multiple workers would each see only their own sessions.
+    # Raise UVICORN_WORKERS only behind a sticky load balancer or once
+    # session state moves to a shared store.
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    if workers > 1:
+        logger.warning(f"Running {workers} workers: summarization sessions are per-process and will not be shared between them")
+    uvicorn.run("main:app", host="0.0.0.0", port=5167, loop=loop_impl, http=http_impl, workers=workers)
\ No newline at end of file
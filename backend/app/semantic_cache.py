@@ -0,0 +1,93 @@
+"""Semantic cache for near-duplicate transcript chunks.
+
+Transcription produces noisy, repetitive chunks (silence padding,
+re-transcribed tails), and each one normally costs a full LLM round-trip.
+This cache embeds chunks locally with sentence-transformers, indexes them in
+FAISS and returns the cached chunk summary when a new chunk is close enough
+in cosine similarity — turning seconds of LLM latency into a millisecond
+vector lookup.
+
+The dependencies are heavyweight and optional: when faiss or
+sentence-transformers are not installed the cache silently disables itself
+and every lookup misses.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+# Cosine similarity above which a chunk is treated as a duplicate.
+_SIMILARITY_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.92'))
+_EMBEDDING_MODEL = os.getenv('SEMANTIC_CACHE_MODEL', 'all-MiniLM-L6-v2')
+
+# The embedding model is shared across all meetings; loading it per
+# summarizer would cost hundreds of MB and seconds of startup each.
+_shared_model = None
+
+
+def _get_model():
+    global _shared_model
+    if _shared_model is None:
+        logger.info(f"Loading semantic cache embedding model '{_EMBEDDING_MODEL}'")
+        _shared_model = SentenceTransformer(_EMBEDDING_MODEL)
+    return _shared_model
+
+
+class SemanticChunkCache:
+    """Per-meeting cache mapping transcript chunks to their chunk summaries.
+
+    All methods are synchronous and CPU-bound; callers on the event loop
+    should dispatch them via asyncio.to_thread.
+    """
+
+    def __init__(self, threshold: float = None, max_entries: int = 512):
+        self.threshold = threshold if threshold is not None else _SIMILARITY_THRESHOLD
+        self.max_entries = max_entries
+        self._index = None
+        self._values = []
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return SEMANTIC_CACHE_AVAILABLE
+
+    def _embed(self, text: str):
+        emb = _get_model().encode([text])
+        emb = np.asarray(emb, dtype='float32')
+        faiss.normalize_L2(emb)
+        return emb
+
+    def get(self, text: str):
+        """Return the cached value for a near-duplicate chunk, or None."""
+        if not SEMANTIC_CACHE_AVAILABLE or self._index is None or not self._values:
+            self.misses += 1
+            return None
+        emb = self._embed(text)
+        similarities, indices = self._index.search(emb, 1)
+        if similarities[0][0] >= self.threshold:
+            self.hits += 1
+            logger.info(f"Semantic cache hit (similarity={similarities[0][0]:.3f}, hits={self.hits}, misses={self.misses})")
+            return self._values[indices[0][0]]
+        self.misses += 1
+        return None
+
+    def put(self, text: str, value):
+        """Store the summary produced for a chunk."""
+        if not SEMANTIC_CACHE_AVAILABLE or len(self._values) >= self.max_entries:
+            return
+        emb = self._embed(text)
+        if self._index is None:
+            # Inner product over L2-normalized vectors == cosine similarity
+            self._index = faiss.IndexFlatIP(emb.shape[1])
+        self._index.add(emb)
+        self._values.append(value)
@@ -10,6 +10,7 @@ from pydantic_ai.providers.anthropic import AnthropicProvider
 
 import logging
 import os
+import weakref
 from dotenv import load_dotenv
 from db import DatabaseManager
 from ollama import chat
@@ -87,7 +88,10 @@ class TranscriptProcessor:
         """Initialize the transcript processor."""
         logger.info("TranscriptProcessor initialized.")
         self.db = DatabaseManager()
-        self.active_clients = []  # Track active Ollama client sessions
+        # Track active Ollama client sessions. A WeakSet gives O(1) discard and
+        # lets the GC reclaim clients that error out before removal, so the set
+        # cannot grow unboundedly across a long run.
+        self.active_clients = weakref.WeakSet()
     async def process_transcript(self, text: str, model: str, model_name: str, chunk_size: int = 5000, overlap: int = 1000, custom_prompt: str = "") -> Tuple[int, List[str]]:
         """
         Process transcript text into chunks and generate structured summaries for each chunk using an AI model.
@@ -262,7 +266,7 @@ class TranscriptProcessor:
         # Create a client and track it for cleanup
         ollama_host = os.getenv('OLLAMA_HOST', 'http://127.0.0.1:11434')
         client = AsyncClient(host=ollama_host)
-        self.active_clients.append(client)
+        self.active_clients.add(client)
         
         try:
             response = await client.chat(model=model_name, messages=[message], stream=True, format=SummaryResponse.model_json_schema())
@@ -287,9 +291,8 @@ class TranscriptProcessor:
             logger.error(f"Error in Ollama chat: {e}")
             raise
         finally:
-            # Remove the client from active clients list
-            if client in self.active_clients:
-                self.active_clients.remove(client)
+            # Remove the client from the active set (no-op if already gone)
+            self.active_clients.discard(client)
 
     def cleanup(self):
         """Clean up resources used by the TranscriptProcessor."""
@@ -303,7 +306,8 @@ class TranscriptProcessor:
             # Cancel any active Ollama client sessions
             if hasattr(self, 'active_clients') and self.active_clients:
                 logger.info(f"Terminating {len(self.active_clients)} active Ollama client sessions")
-                for client in self.active_clients:
+                # Snapshot first: the WeakSet can shrink while we iterate
+                for client in list(self.active_clients):
                     try:
                         # Close the client's underlying connection
                         if hasattr(client, '_client') and hasattr(client._client, 'close'):